@@ -9,14 +9,22 @@ from flask import (
     send_file,
     Response,
 )
-import psycopg2
+import psycopg
+from psycopg_pool import ConnectionPool
+import orjson
 import os
 import secrets
+import hashlib
 import feedparser
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from cachetools import TTLCache
 from dotenv import load_dotenv
 import requests
-from bs4 import BeautifulSoup
+import http.cookiejar
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urlparse
 import xml.etree.ElementTree as ET
 import io
@@ -25,12 +33,45 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY")
 ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Only long-lived servers (see gunicorn.conf.py) keep threads alive after a
+# response; serverless deployments such as Vercel must do the work inline.
+BACKGROUND_TASKS = os.getenv("BACKGROUND_TASKS") == "1"
+INDEX_TEMPLATE_MTIME = str(
+    os.path.getmtime(os.path.join(app.root_path, "templates", "index.html"))
+)
 
 
-def get_db_connection():
-    db_url = os.getenv("DATABASE_URL")
-    conn = psycopg2.connect(db_url, sslmode="require")
-    return conn
+pool = ConnectionPool(
+    os.getenv("DATABASE_URL"),
+    min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+    max_size=20,
+    kwargs={"sslmode": "require", "prepare_threshold": 3},
+    check=ConnectionPool.check_connection,
+    open=True,
+)
+ingest_executor = ThreadPoolExecutor(max_workers=4)
+content_cache = TTLCache(maxsize=1024, ttl=3600)
+content_cache_lock = threading.Lock()
+session = requests.Session()
+session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+session.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+)
+session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+session.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=64))
+CONTENT_SELECTORS = [
+    "article",
+    ".article-body",
+    ".post-content",
+    ".entry-content",
+    ".main-content",
+    ".content",
+    ".post-body",
+    ".blog-post-body",
+]
+CONTENT_SELECTOR = ", ".join(CONTENT_SELECTORS)
 
 
 def generate_token():
@@ -38,67 +79,210 @@ def generate_token():
 
 
 def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS feeds_a1b2c3 (
+                id SERIAL PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                priority INTEGER DEFAULT 0,
+                token TEXT NOT NULL,
+                update_frequency INTEGER DEFAULT 0,
+                last_checked TIMESTAMP,
+                next_check TIMESTAMP,
+                paused BOOLEAN DEFAULT FALSE,
+                etag TEXT,
+                last_modified TEXT,
+                UNIQUE (url, token)
+            )
+            """
+        )
+        cur.execute(
+            """
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'feeds_a1b2c3'
+            AND column_name IN ('etag', 'last_modified')
+            """
+        )
+        if cur.fetchone()[0] < 2:
+            cur.execute(
+                """
+                ALTER TABLE feeds_a1b2c3
+                ADD COLUMN IF NOT EXISTS etag TEXT,
+                ADD COLUMN IF NOT EXISTS last_modified TEXT
+                """
+            )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles_d4e5f6 (
+                id SERIAL PRIMARY KEY,
+                feed_id INTEGER REFERENCES feeds_a1b2c3(id),
+                title TEXT NOT NULL,
+                url TEXT NOT NULL,
+                content TEXT,
+                published_at TIMESTAMP,
+                is_read BOOLEAN DEFAULT FALSE,
+                starred BOOLEAN DEFAULT FALSE,
+                token TEXT NOT NULL,
+                UNIQUE (url, token)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_feeds_token
+            ON feeds_a1b2c3 (token)
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_articles_feed_token_unread
+            ON articles_d4e5f6 (feed_id, token)
+            WHERE is_read = FALSE
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_articles_feed_token_pub
+            ON articles_d4e5f6 (feed_id, token, published_at DESC)
+            """
+        )
+        cur.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_articles_starred
+            ON articles_d4e5f6 (token)
+            WHERE starred = TRUE
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scrape_cache_g7h8i9 (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content TEXT,
+                fetched_at TIMESTAMP
+            )
+            """
+        )
+        cur.execute(
+            """
+            DELETE FROM scrape_cache_g7h8i9
+            WHERE fetched_at < NOW() - INTERVAL '30 days'
+            """
+        )
+
+
+def build_article_rows(feed_id, entries, token):
+    rows = []
+    for entry in entries:
+        published_at = None
+        if hasattr(entry, "published_parsed"):
+            published_at = datetime(*entry.published_parsed[:6])
+        content = entry.description if hasattr(entry, "description") else entry.title
+        rows.append((feed_id, entry.title, entry.link, content, published_at, token))
+    return rows
+
+
+def insert_articles(cur, rows):
+    if not rows:
+        return 0
     cur.execute(
         """
-        CREATE TABLE IF NOT EXISTS feeds_a1b2c3 (
-            id SERIAL PRIMARY KEY,
-            url TEXT NOT NULL,
-            title TEXT NOT NULL,
-            priority INTEGER DEFAULT 0,
-            token TEXT NOT NULL,
-            update_frequency INTEGER DEFAULT 0,
-            last_checked TIMESTAMP,
-            next_check TIMESTAMP,
-            paused BOOLEAN DEFAULT FALSE,
-            UNIQUE (url, token)
-        )
+        CREATE TEMP TABLE articles_staging (
+            feed_id INTEGER,
+            title TEXT,
+            url TEXT,
+            content TEXT,
+            published_at TIMESTAMP,
+            token TEXT
+        ) ON COMMIT DROP
         """
     )
+    with cur.copy(
+        "COPY articles_staging (feed_id, title, url, content, published_at, token) FROM STDIN"
+    ) as copy:
+        for row in rows:
+            copy.write_row(row)
     cur.execute(
         """
-        CREATE TABLE IF NOT EXISTS articles_d4e5f6 (
-            id SERIAL PRIMARY KEY,
-            feed_id INTEGER REFERENCES feeds_a1b2c3(id),
-            title TEXT NOT NULL,
-            url TEXT NOT NULL,
-            content TEXT,
-            published_at TIMESTAMP,
-            is_read BOOLEAN DEFAULT FALSE,
-            starred BOOLEAN DEFAULT FALSE,
-            token TEXT NOT NULL,
-            UNIQUE (url, token)
-        )
+        INSERT INTO articles_d4e5f6 (feed_id, title, url, content, published_at, token)
+        SELECT feed_id, title, url, content, published_at, token FROM articles_staging
+        ON CONFLICT (url, token) DO NOTHING
         """
     )
-    conn.commit()
-    cur.close()
-    conn.close()
+    return cur.rowcount
+
+
+def response_html(response):
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        return response.text
+    return response.content
+
+
+def content_selector_rank(node):
+    classes = (node.attributes.get("class") or "").lower().split()
+    for rank, selector in enumerate(CONTENT_SELECTORS):
+        if selector == node.tag or (selector.startswith(".") and selector[1:] in classes):
+            return rank
+    return len(CONTENT_SELECTORS)
+
+
+def extract_article_text(html):
+    tree = LexborHTMLParser(html, encoding=True)
+    tree.strip_tags(["script", "style", "noscript", "template"])
+    matches = tree.css(CONTENT_SELECTOR)
+    if matches:
+        node = min(matches, key=content_selector_rank)
+        return node.text(separator="\n", strip=True, skip_empty=True)
+    return (tree.body or tree.root).text(separator="\n", strip=True, skip_empty=True)
 
 
 def fetch_full_content(url):
+    with content_cache_lock:
+        content = content_cache.get(url)
+    if content is not None:
+        return content
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-        selectors = [
-            "article",
-            ".article-body",
-            ".post-content",
-            ".entry-content",
-            ".main-content",
-            ".content",
-            ".post-body",
-            ".blog-post-body",
-        ]
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element:
-                return element.get_text(separator="\n", strip=True)
-        return soup.get_text(separator="\n", strip=True)
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT etag, last_modified, content FROM scrape_cache_g7h8i9 WHERE url = %s
+                """,
+                (url,),
+            )
+            cached = cur.fetchone()
+        headers = {}
+        if cached:
+            if cached[0]:
+                headers["If-None-Match"] = cached[0]
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
+        response = session.get(url, headers=headers, timeout=10)
+        if cached and response.status_code == 304:
+            with content_cache_lock:
+                content_cache[url] = cached[2]
+            return cached[2]
+        content = extract_article_text(response_html(response))
+        if response.status_code == 200:
+            with content_cache_lock:
+                content_cache[url] = content
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            with pool.connection() as conn, conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO scrape_cache_g7h8i9 (url, etag, last_modified, content, fetched_at)
+                    VALUES (%s, %s, %s, %s, NOW())
+                    ON CONFLICT (url) DO UPDATE
+                    SET etag = EXCLUDED.etag, last_modified = EXCLUDED.last_modified,
+                        content = EXCLUDED.content, fetched_at = EXCLUDED.fetched_at
+                    """,
+                    (url, etag, last_modified, content),
+                )
+        return content
     except Exception as e:
         print(f"Error fetching full content: {e}")
         return None
@@ -106,23 +290,73 @@ def fetch_full_content(url):
 
 def extract_feed_url_from_html(html_url):
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(html_url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, "html.parser")
-        feed_link = soup.find("link", {"type": "application/rss+xml"})
-        if feed_link and feed_link.get("href"):
-            return feed_link.get("href")
-        feed_link = soup.find("link", {"type": "application/atom+xml"})
-        if feed_link and feed_link.get("href"):
-            return feed_link.get("href")
+        response = session.get(html_url, timeout=10)
+        tree = LexborHTMLParser(response_html(response), encoding=True)
+        feed_link = tree.css_first('link[type="application/rss+xml"]')
+        if feed_link and feed_link.attributes.get("href"):
+            return feed_link.attributes.get("href")
+        feed_link = tree.css_first('link[type="application/atom+xml"]')
+        if feed_link and feed_link.attributes.get("href"):
+            return feed_link.attributes.get("href")
         return None
     except Exception as e:
         print(f"Error extracting feed URL: {e}")
         return None
 
 
+def run_in_background(task, *args):
+    def run():
+        try:
+            task(*args)
+        except Exception as e:
+            print(f"Error in background task {task.__name__}: {e}")
+
+    ingest_executor.submit(run)
+
+
+def ingest_feed(feed_id, token, feed_url, etag, last_modified):
+    feed = feedparser.parse(feed_url, etag=etag, modified=last_modified)
+    if feed.get("status") == 304:
+        return
+    with pool.connection() as conn, conn.cursor() as cur:
+        insert_articles(cur, build_article_rows(feed_id, feed.entries, token))
+        cur.execute(
+            """
+            UPDATE feeds_a1b2c3
+            SET etag = COALESCE(%s, etag), last_modified = COALESCE(%s, last_modified)
+            WHERE id = %s AND token = %s
+            """,
+            (feed.get("etag"), feed.get("modified"), feed_id, token),
+        )
+        refresh_placeholder_title(cur, feed_id, token, feed)
+
+
+def initial_feed_title(feed_url):
+    if BACKGROUND_TASKS:
+        return feed_url
+    return feedparser.parse(feed_url).feed.get("title", "Untitled Feed")
+
+
+def resolve_feed_title(feed_id, feed_url):
+    feed = feedparser.parse(feed_url)
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "UPDATE feeds_a1b2c3 SET title = %s WHERE id = %s AND title = url",
+            (feed.feed.get("title", "Untitled Feed"), feed_id),
+        )
+
+
+def refresh_placeholder_title(cur, feed_id, token, feed):
+    if feed.feed.get("title"):
+        cur.execute(
+            """
+            UPDATE feeds_a1b2c3 SET title = %s
+            WHERE id = %s AND token = %s AND title IN (url, 'Untitled Feed')
+            """,
+            (feed.feed.title, feed_id, token),
+        )
+
+
 @app.route("/")
 def index():
     token = request.args.get("token")
@@ -135,28 +369,30 @@ def index():
         return resp
     feed_url = request.args.get("feed_url")
     if feed_url:
-        feed = feedparser.parse(feed_url)
-        feed_title = feed.feed.get("title", "Untitled Feed")
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id FROM feeds_a1b2c3 WHERE url = %s AND token = %s
-            """,
-            (feed_url, token),
-        )
-        if not cur.fetchone():
+        feed_title = initial_feed_title(feed_url)
+        with pool.connection() as conn, conn.cursor() as cur:
             cur.execute(
                 """
                 INSERT INTO feeds_a1b2c3 (url, title, token)
                 VALUES (%s, %s, %s)
+                ON CONFLICT (url, token) DO NOTHING
+                RETURNING id
                 """,
                 (feed_url, feed_title, token),
             )
-            conn.commit()
-        cur.close()
-        conn.close()
-    resp = make_response(render_template("index.html", token=token))
+            result = cur.fetchone()
+        if result and BACKGROUND_TASKS:
+            run_in_background(resolve_feed_title, result[0], feed_url)
+    etag = hashlib.blake2b(
+        (token + INDEX_TEMPLATE_MTIME).encode(), digest_size=16
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    else:
+        resp = make_response(render_template("index.html", token=token))
+    resp.set_etag(etag)
+    resp.cache_control.private = True
+    resp.cache_control.max_age = 0
     resp.set_cookie("token", token)
     return resp
 
@@ -181,17 +417,14 @@ def export_opml():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT title, url FROM feeds_a1b2c3 WHERE token = %s ORDER BY title ASC
-        """,
-        (token,),
-    )
-    feeds = cur.fetchall()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT title, url FROM feeds_a1b2c3 WHERE token = %s ORDER BY title ASC
+            """,
+            (token,),
+        )
+        feeds = cur.fetchall()
     opml = ET.Element("opml", version="1.0")
     head = ET.SubElement(opml, "head")
     title = ET.SubElement(head, "title")
@@ -217,27 +450,26 @@ def add_feed():
     feed_url = request.json.get("url")
     if not feed_url:
         return jsonify({"error": "URL is required"}), 400
-    feed = feedparser.parse(feed_url)
-    feed_title = feed.feed.get("title", "Untitled Feed")
-    conn = get_db_connection()
-    cur = conn.cursor()
+    feed_title = initial_feed_title(feed_url)
     try:
-        cur.execute(
-            """
-            INSERT INTO feeds_a1b2c3 (url, title, token)
-            VALUES (%s, %s, %s)
-            """,
-            (feed_url, feed_title, token),
-        )
-        conn.commit()
-    except Exception as e:
-        if "unique_feed_url" in str(e):
-            return jsonify({"error": "Feed already exists"}), 400
-        else:
-            return jsonify({"error": "Database error"}), 500
-    finally:
-        cur.close()
-        conn.close()
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO feeds_a1b2c3 (url, title, token)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (url, token) DO NOTHING
+                RETURNING id
+                """,
+                (feed_url, feed_title, token),
+            )
+            result = cur.fetchone()
+    except psycopg.Error as e:
+        print(f"Database error: {e}")
+        return jsonify({"error": "Database error"}), 500
+    if result is None:
+        return jsonify({"error": "Feed already exists"}), 400
+    if BACKGROUND_TASKS:
+        run_in_background(resolve_feed_title, result[0], feed_url)
     return jsonify({"status": "success", "title": feed_title})
 
 
@@ -249,62 +481,57 @@ def update_feed():
     feed_id = request.json.get("feed_id")
     if not feed_id:
         return jsonify({"error": "Feed ID is required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT url FROM feeds_a1b2c3 WHERE id = %s AND token = %s", (feed_id, token)
-    )
-    result = cur.fetchone()
-    if not result:
-        cur.close()
-        conn.close()
-        return jsonify({"error": "Feed not found"}), 404
-    feed_url = result[0]
-    feed = feedparser.parse(feed_url)
-    new_articles = 0
-    for entry in feed.entries:
-        published_at = None
-        if hasattr(entry, "published_parsed"):
-            published_at = datetime(*entry.published_parsed[:6])
-        content = entry.description if hasattr(entry, "description") else entry.title
+    with pool.connection() as conn, conn.cursor() as cur:
         cur.execute(
             """
-            INSERT INTO articles_d4e5f6 (feed_id, title, url, content, published_at, token)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (url, token) DO NOTHING
-            """,
-            (feed_id, entry.title, entry.link, content, published_at, token),
-        )
-        new_articles += cur.rowcount
-    cur.execute(
-        """
-        UPDATE feeds_a1b2c3
-        SET update_frequency = update_frequency + %s, last_checked = NOW()
-        WHERE id = %s AND token = %s
-        """,
-        (new_articles, feed_id, token),
-    )
-    if new_articles > 0:
-        cur.execute(
-            """
-            UPDATE feeds_a1b2c3
-            SET next_check = NOW() + INTERVAL '15 minutes' * (1 / (update_frequency + 1))
-            WHERE id = %s AND token = %s
+            SELECT url, etag, last_modified FROM feeds_a1b2c3 WHERE id = %s AND token = %s
             """,
             (feed_id, token),
         )
-    else:
-        cur.execute(
-            """
-            UPDATE feeds_a1b2c3
-            SET next_check = NOW() + INTERVAL '1 hour' * (update_frequency + 1)
-            WHERE id = %s AND token = %s
-            """,
-            (feed_id, token),
+        result = cur.fetchone()
+    if not result:
+        return jsonify({"error": "Feed not found"}), 404
+    feed_url, etag, last_modified = result
+    feed = feedparser.parse(feed_url, etag=etag, modified=last_modified)
+    with pool.connection() as conn, conn.cursor() as cur:
+        new_articles = insert_articles(
+            cur, build_article_rows(feed_id, feed.entries, token)
         )
-    conn.commit()
-    cur.close()
-    conn.close()
+        with conn.pipeline():
+            cur.execute(
+                """
+                UPDATE feeds_a1b2c3
+                SET update_frequency = update_frequency + %s, last_checked = NOW(),
+                    etag = COALESCE(%s, etag), last_modified = COALESCE(%s, last_modified)
+                WHERE id = %s AND token = %s
+                """,
+                (
+                    new_articles,
+                    feed.get("etag"),
+                    feed.get("modified"),
+                    feed_id,
+                    token,
+                ),
+            )
+            if new_articles > 0:
+                cur.execute(
+                    """
+                    UPDATE feeds_a1b2c3
+                    SET next_check = NOW() + INTERVAL '15 minutes' * (1 / (update_frequency + 1))
+                    WHERE id = %s AND token = %s
+                    """,
+                    (feed_id, token),
+                )
+            else:
+                cur.execute(
+                    """
+                    UPDATE feeds_a1b2c3
+                    SET next_check = NOW() + INTERVAL '1 hour' * (update_frequency + 1)
+                    WHERE id = %s AND token = %s
+                    """,
+                    (feed_id, token),
+                )
+            refresh_placeholder_title(cur, feed_id, token, feed)
     return jsonify({"status": "success", "new_articles": new_articles})
 
 
@@ -313,22 +540,19 @@ def feeds_to_poll():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, url, title
-        FROM feeds_a1b2c3
-        WHERE token = %s
-        AND paused = FALSE
-        AND (next_check IS NULL OR next_check <= NOW())
-        ORDER BY priority DESC, update_frequency DESC, title ASC
-        """,
-        (token,),
-    )
-    feeds = [{"id": row[0], "url": row[1], "title": row[2]} for row in cur.fetchall()]
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT id, url, title
+            FROM feeds_a1b2c3
+            WHERE token = %s
+            AND paused = FALSE
+            AND (next_check IS NULL OR next_check <= NOW())
+            ORDER BY priority DESC, update_frequency DESC, title ASC
+            """,
+            (token,),
+        )
+        feeds = [{"id": row[0], "url": row[1], "title": row[2]} for row in cur.fetchall()]
     return jsonify({"feeds": feeds})
 
 
@@ -337,20 +561,17 @@ def all_feeds_with_frequency():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, url, title, update_frequency FROM feeds_a1b2c3 WHERE token = %s ORDER BY update_frequency DESC, title ASC
-        """,
-        (token,),
-    )
-    feeds = [
-        {"id": row[0], "url": row[1], "title": row[2], "update_frequency": row[3]}
-        for row in cur.fetchall()
-    ]
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT id, url, title, update_frequency FROM feeds_a1b2c3 WHERE token = %s ORDER BY update_frequency DESC, title ASC
+            """,
+            (token,),
+        )
+        feeds = [
+            {"id": row[0], "url": row[1], "title": row[2], "update_frequency": row[3]}
+            for row in cur.fetchall()
+        ]
     return jsonify({"feeds": feeds})
 
 
@@ -359,17 +580,14 @@ def all_feeds():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, url, title FROM feeds_a1b2c3 WHERE token = %s ORDER BY priority ASC, title DESC
-        """,
-        (token,),
-    )
-    feeds = [{"id": row[0], "url": row[1], "title": row[2]} for row in cur.fetchall()]
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT id, url, title FROM feeds_a1b2c3 WHERE token = %s ORDER BY priority ASC, title DESC
+            """,
+            (token,),
+        )
+        feeds = [{"id": row[0], "url": row[1], "title": row[2]} for row in cur.fetchall()]
     return jsonify({"feeds": feeds})
 
 
@@ -378,28 +596,23 @@ def load_feeds():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT f.id, f.url, f.title,
-               (SELECT COUNT(*) FROM articles_d4e5f6 WHERE feed_id = f.id AND is_read = FALSE AND token = f.token) as unread_count
-        FROM feeds_a1b2c3 f
-        WHERE f.token = %s
-        AND EXISTS (
-            SELECT 1 FROM articles_d4e5f6
-            WHERE feed_id = f.id AND is_read = FALSE AND token = f.token
-        )
-        ORDER BY unread_count ASC
-        """,
-        (token,),
-    )
-    feeds = [
-        {"id": row[0], "url": row[1], "title": row[2], "unread_count": row[3]}
-        for row in cur.fetchall()
-    ]
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT f.id, f.url, f.title, COUNT(a.id) as unread_count
+            FROM feeds_a1b2c3 f
+            JOIN articles_d4e5f6 a
+              ON a.feed_id = f.id AND a.token = f.token AND a.is_read = FALSE
+            WHERE f.token = %s
+            GROUP BY f.id
+            ORDER BY unread_count ASC
+            """,
+            (token,),
+        )
+        feeds = [
+            {"id": row[0], "url": row[1], "title": row[2], "unread_count": row[3]}
+            for row in cur.fetchall()
+        ]
     return jsonify({"feeds": feeds})
 
 
@@ -411,34 +624,20 @@ def fetch_articles():
     feed_id = request.json.get("feed_id")
     if not feed_id:
         return jsonify({"error": "Feed ID is required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT url FROM feeds_a1b2c3 WHERE id = %s AND token = %s", (feed_id, token)
-    )
-    result = cur.fetchone()
-    if not result:
-        cur.close()
-        conn.close()
-        return jsonify({"error": "Feed not found"}), 404
-    feed_url = result[0]
-    feed = feedparser.parse(feed_url)
-    for entry in feed.entries:
-        published_at = None
-        if hasattr(entry, "published_parsed"):
-            published_at = datetime(*entry.published_parsed[:6])
-        content = entry.description if hasattr(entry, "description") else entry.title
+    with pool.connection() as conn, conn.cursor() as cur:
         cur.execute(
             """
-            INSERT INTO articles_d4e5f6 (feed_id, title, url, content, published_at, token)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (url, token) DO NOTHING
+            SELECT url, etag, last_modified FROM feeds_a1b2c3 WHERE id = %s AND token = %s
             """,
-            (feed_id, entry.title, entry.link, content, published_at, token),
+            (feed_id, token),
         )
-    conn.commit()
-    cur.close()
-    conn.close()
+        result = cur.fetchone()
+    if not result:
+        return jsonify({"error": "Feed not found"}), 404
+    if BACKGROUND_TASKS:
+        run_in_background(ingest_feed, feed_id, token, *result)
+        return jsonify({"status": "queued"}), 202
+    ingest_feed(feed_id, token, *result)
     return jsonify({"status": "success"})
 
 
@@ -452,22 +651,16 @@ def load_articles():
         exclude_starred = request.args.get("exclude_starred", "false").lower() == "true"
         if not feed_id:
             return jsonify({"error": "Feed ID is required"}), 400
-        conn = get_db_connection()
-        cur = conn.cursor()
         if exclude_starred:
-            cur.execute(
-                """
+            query = """
                 SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, f.url as feed_url
                 FROM articles_d4e5f6 a
                 JOIN feeds_a1b2c3 f ON a.feed_id = f.id
                 WHERE a.feed_id = %s AND a.token = %s AND a.starred = FALSE AND a.is_read = FALSE
                 ORDER BY a.published_at DESC
-                """,
-                (feed_id, token),
-            )
-        else:
-            cur.execute(
                 """
+        else:
+            query = """
                 SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, f.url as feed_url
                 FROM articles_d4e5f6 a
                 JOIN feeds_a1b2c3 f ON a.feed_id = f.id
@@ -479,26 +672,35 @@ def load_articles():
                         WHEN a.starred = TRUE THEN 2
                     END,
                     a.published_at DESC
-                """,
-                (feed_id, token),
-            )
-        articles = [
-            {
-                "id": row[0],
-                "title": row[1],
-                "url": row[2],
-                "content": row[3],
-                "published_at": row[4].isoformat() if row[4] else None,
-                "is_read": row[5],
-                "starred": row[6],
-                "feed_url": row[7],
-            }
-            for row in cur.fetchall()
-        ]
-        cur.close()
-        conn.close()
-        return jsonify({"articles": articles})
-    except psycopg2.Error as e:
+                """
+        rows_json = []
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(query, (feed_id, token))
+            while True:
+                rows = cur.fetchmany(500)
+                if not rows:
+                    break
+                rows_json.extend(
+                    orjson.dumps(
+                        {
+                            "id": row[0],
+                            "title": row[1],
+                            "url": row[2],
+                            "content": row[3],
+                            "published_at": row[4],
+                            "is_read": row[5],
+                            "starred": row[6],
+                            "feed_url": row[7],
+                        },
+                        option=orjson.OPT_NAIVE_UTC,
+                    )
+                    for row in rows
+                )
+        return app.response_class(
+            b'{"articles":[' + b",".join(rows_json) + b"]}",
+            mimetype="application/json",
+        )
+    except psycopg.Error as e:
         print(f"Database error: {e}")
         return jsonify({"error": "Database error"}), 500
     except Exception as e:
@@ -514,31 +716,26 @@ def api_fetch_full_content():
     article_id = request.json.get("article_id")
     if not article_id:
         return jsonify({"error": "Article ID is required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        "SELECT url FROM articles_d4e5f6 WHERE id = %s AND token = %s",
-        (article_id, token),
-    )
-    result = cur.fetchone()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT url FROM articles_d4e5f6 WHERE id = %s AND token = %s",
+            (article_id, token),
+        )
+        result = cur.fetchone()
     if not result:
-        cur.close()
-        conn.close()
         return jsonify({"error": "Article not found"}), 404
     article_url = result[0]
     full_content = fetch_full_content(article_url)
     if full_content:
-        cur.execute(
-            """
-            UPDATE articles_d4e5f6
-            SET content = %s
-            WHERE id = %s AND token = %s
-            """,
-            (full_content, article_id, token),
-        )
-        conn.commit()
-    cur.close()
-    conn.close()
+        with pool.connection() as conn, conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE articles_d4e5f6
+                SET content = %s
+                WHERE id = %s AND token = %s
+                """,
+                (full_content, article_id, token),
+            )
     return jsonify({"content": full_content})
 
 
@@ -550,19 +747,15 @@ def mark_as_read():
     article_id = request.json.get("article_id")
     if not article_id:
         return jsonify({"error": "Article ID is required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE articles_d4e5f6
-        SET is_read = TRUE
-        WHERE id = %s AND token = %s
-        """,
-        (article_id, token),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE articles_d4e5f6
+            SET is_read = TRUE
+            WHERE id = %s AND token = %s
+            """,
+            (article_id, token),
+        )
     return jsonify({"status": "success"})
 
 
@@ -571,19 +764,15 @@ def mark_starred_as_read():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE articles_d4e5f6
-        SET is_read = TRUE
-        WHERE starred = TRUE AND token = %s
-        """,
-        (token,),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE articles_d4e5f6
+            SET is_read = TRUE
+            WHERE starred = TRUE AND token = %s
+            """,
+            (token,),
+        )
     return jsonify({"status": "success"})
 
 
@@ -594,19 +783,15 @@ def toggle_starred():
         return jsonify({"error": "Token not found"}), 403
     article_id = request.json.get("id")
     new_starred = request.json.get("starred")
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE articles_d4e5f6
-        SET starred = %s, is_read = CASE WHEN %s = TRUE THEN TRUE ELSE is_read END
-        WHERE id = %s AND token = %s
-        """,
-        (new_starred, new_starred, article_id, token),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE articles_d4e5f6
+            SET starred = %s, is_read = CASE WHEN %s = TRUE THEN TRUE ELSE is_read END
+            WHERE id = %s AND token = %s
+            """,
+            (new_starred, new_starred, article_id, token),
+        )
     return jsonify({"status": "success"})
 
 
@@ -627,28 +812,19 @@ def subscribe_feed():
     feed = feedparser.parse(feed_url)
     if not feed.feed.get("title"):
         return jsonify({"error": "Invalid feed"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id FROM feeds_a1b2c3 WHERE url = %s AND token = %s
-        """,
-        (feed_url, token),
-    )
-    if cur.fetchone():
-        cur.close()
-        conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO feeds_a1b2c3 (url, title, token)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (url, token) DO NOTHING
+            RETURNING id
+            """,
+            (feed_url, feed.feed.title, token),
+        )
+        result = cur.fetchone()
+    if result is None:
         return jsonify({"error": "Feed already exists"}), 400
-    cur.execute(
-        """
-        INSERT INTO feeds_a1b2c3 (url, title, token)
-        VALUES (%s, %s, %s)
-        """,
-        (feed_url, feed.feed.title, token),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
     return jsonify({"status": "success"})
 
 
@@ -657,32 +833,32 @@ def load_starred_articles():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT a.id, a.title, a.url, a.content, a.published_at, f.url as feed_url
-        FROM articles_d4e5f6 a
-        JOIN feeds_a1b2c3 f ON a.feed_id = f.id
-        WHERE a.starred = TRUE AND a.token = %s
-        ORDER BY a.published_at DESC
-        """,
-        (token,),
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT a.id, a.title, a.url, a.content, a.published_at, f.url as feed_url
+            FROM articles_d4e5f6 a
+            JOIN feeds_a1b2c3 f ON a.feed_id = f.id
+            WHERE a.starred = TRUE AND a.token = %s
+            ORDER BY a.published_at DESC
+            """,
+            (token,),
+        )
+        articles = [
+            {
+                "id": row[0],
+                "title": row[1],
+                "url": row[2],
+                "content": row[3],
+                "published_at": row[4],
+                "feed_url": row[5],
+            }
+            for row in cur.fetchall()
+        ]
+    return app.response_class(
+        orjson.dumps({"articles": articles}, option=orjson.OPT_NAIVE_UTC),
+        mimetype="application/json",
     )
-    articles = [
-        {
-            "id": row[0],
-            "title": row[1],
-            "url": row[2],
-            "content": row[3],
-            "published_at": row[4].isoformat() if row[4] else None,
-            "feed_url": row[5],
-        }
-        for row in cur.fetchall()
-    ]
-    cur.close()
-    conn.close()
-    return jsonify({"articles": articles})
 
 
 @app.route("/api/purge_feed", methods=["POST"])
@@ -693,19 +869,15 @@ def purge_feed():
     feed_id = request.json.get("feed_id")
     if not feed_id:
         return jsonify({"error": "Feed ID is required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE articles_d4e5f6
-        SET is_read = TRUE
-        WHERE feed_id = %s AND token = %s AND starred = FALSE
-        """,
-        (feed_id, token),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE articles_d4e5f6
+            SET is_read = TRUE
+            WHERE feed_id = %s AND token = %s AND starred = FALSE
+            """,
+            (feed_id, token),
+        )
     return jsonify({"status": "success"})
 
 
@@ -715,35 +887,35 @@ def search_articles():
     query = request.args.get("query")
     if not token or not query:
         return jsonify({"error": "Token and query are required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, f.url as feed_url
-        FROM articles_d4e5f6 a
-        JOIN feeds_a1b2c3 f ON a.feed_id = f.id
-        WHERE a.token = %s
-        AND (a.title ILIKE %s OR a.content ILIKE %s)
-        ORDER BY a.published_at DESC
-        """,
-        (token, f"%{query}%", f"%{query}%"),
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, f.url as feed_url
+            FROM articles_d4e5f6 a
+            JOIN feeds_a1b2c3 f ON a.feed_id = f.id
+            WHERE a.token = %s
+            AND (a.title ILIKE %s OR a.content ILIKE %s)
+            ORDER BY a.published_at DESC
+            """,
+            (token, f"%{query}%", f"%{query}%"),
+        )
+        articles = [
+            {
+                "id": row[0],
+                "title": row[1],
+                "url": row[2],
+                "content": row[3],
+                "published_at": row[4],
+                "is_read": row[5],
+                "starred": row[6],
+                "feed_url": row[7],
+            }
+            for row in cur.fetchall()
+        ]
+    return app.response_class(
+        orjson.dumps({"articles": articles}, option=orjson.OPT_NAIVE_UTC),
+        mimetype="application/json",
     )
-    articles = [
-        {
-            "id": row[0],
-            "title": row[1],
-            "url": row[2],
-            "content": row[3],
-            "published_at": row[4].isoformat() if row[4] else None,
-            "is_read": row[5],
-            "starred": row[6],
-            "feed_url": row[7],
-        }
-        for row in cur.fetchall()
-    ]
-    cur.close()
-    conn.close()
-    return jsonify({"articles": articles})
 
 
 @app.route("/api/sync_starred_to_bookmarks", methods=["POST"])
@@ -752,34 +924,27 @@ def sync_starred_to_bookmarks():
     bookmark_token = request.json.get("bookmark_token")
     if not rss_token or not bookmark_token:
         return jsonify({"error": "Both RSS token and bookmark token are required"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT url, title FROM articles_d4e5f6
-        WHERE starred = TRUE AND token = %s
-        AND url NOT IN (SELECT url FROM bookmarks WHERE token = %s)
-        """,
-        (rss_token, bookmark_token),
-    )
-    starred_articles = cur.fetchall()
-    if not starred_articles:
-        cur.close()
-        conn.close()
-        return jsonify({"status": "success", "synced": 0})
-    for url, title in starred_articles:
+    with pool.connection() as conn, conn.cursor() as cur:
         cur.execute(
+            """
+            SELECT url, title FROM articles_d4e5f6
+            WHERE starred = TRUE AND token = %s
+            AND url NOT IN (SELECT url FROM bookmarks WHERE token = %s)
+            """,
+            (rss_token, bookmark_token),
+        )
+        starred_articles = cur.fetchall()
+        if not starred_articles:
+            return jsonify({"status": "success", "synced": 0})
+        cur.executemany(
             """
             INSERT INTO bookmarks (url, title, token)
             VALUES (%s, %s, %s)
             ON CONFLICT (url, token) DO NOTHING
             """,
-            (url, title, bookmark_token),
+            [(url, title, bookmark_token) for url, title in starred_articles],
         )
-    conn.commit()
-    synced_count = cur.rowcount
-    cur.close()
-    conn.close()
+        synced_count = cur.rowcount
     return jsonify({"status": "success", "synced": synced_count})
 
 
@@ -792,19 +957,15 @@ def pause_feed():
     paused = request.json.get("paused")
     if not feed_id or paused is None:
         return jsonify({"error": "Feed ID and paused status are required"}), 400
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE feeds_a1b2c3
-        SET paused = %s
-        WHERE id = %s AND token = %s
-        """,
-        (paused, feed_id, token),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE feeds_a1b2c3
+            SET paused = %s
+            WHERE id = %s AND token = %s
+            """,
+            (paused, feed_id, token),
+        )
     return jsonify({"status": "success"})
 
 
@@ -818,42 +979,39 @@ def favs():
         resp = make_response(redirect(url_for("favs", token=token)))
         resp.set_cookie("token", token)
         return resp
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT
-            f.id as feed_id, f.title as feed_title, f.url as feed_url,
-            a.id as article_id, a.title as article_title, a.url as article_url,
-            a.content as article_content, a.published_at as article_published_at
-        FROM articles_d4e5f6 a
-        JOIN feeds_a1b2c3 f ON a.feed_id = f.id
-        WHERE a.starred = TRUE AND a.token = %s
-        ORDER BY f.title ASC, a.published_at DESC
-        """,
-        (token,),
-    )
-    rows = cur.fetchall()
-    starred_articles_by_feed = {}
-    for row in rows:
-        feed_id = row[0]
-        if feed_id not in starred_articles_by_feed:
-            starred_articles_by_feed[feed_id] = {
-                "feed_title": row[1],
-                "feed_url": row[2],
-                "articles": [],
-            }
-        starred_articles_by_feed[feed_id]["articles"].append(
-            {
-                "article_id": row[3],
-                "article_title": row[4],
-                "article_url": row[5],
-                "article_content": row[6],
-                "article_published_at": row[7].isoformat() if row[7] else None,
-            }
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT
+                f.id as feed_id, f.title as feed_title, f.url as feed_url,
+                a.id as article_id, a.title as article_title, a.url as article_url,
+                a.content as article_content, a.published_at as article_published_at
+            FROM articles_d4e5f6 a
+            JOIN feeds_a1b2c3 f ON a.feed_id = f.id
+            WHERE a.starred = TRUE AND a.token = %s
+            ORDER BY f.title ASC, a.published_at DESC
+            """,
+            (token,),
         )
-    cur.close()
-    conn.close()
+        rows = cur.fetchall()
+        starred_articles_by_feed = {}
+        for row in rows:
+            feed_id = row[0]
+            if feed_id not in starred_articles_by_feed:
+                starred_articles_by_feed[feed_id] = {
+                    "feed_title": row[1],
+                    "feed_url": row[2],
+                    "articles": [],
+                }
+            starred_articles_by_feed[feed_id]["articles"].append(
+                {
+                    "article_id": row[3],
+                    "article_title": row[4],
+                    "article_url": row[5],
+                    "article_content": row[6],
+                    "article_published_at": row[7].isoformat() if row[7] else None,
+                }
+            )
     resp = make_response(
         render_template(
             "favs.html", starred_articles_by_feed=starred_articles_by_feed, token=token
@@ -868,53 +1026,54 @@ def load_all_unread():
     token = request.cookies.get("token")
     if not token:
         return jsonify({"error": "Token not found"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, a.feed_id, f.url as feed_url
-        FROM articles_d4e5f6 a
-        JOIN feeds_a1b2c3 f ON a.feed_id = f.id
-        WHERE a.is_read = FALSE AND a.starred = FALSE AND a.token = %s
-        ORDER BY a.title ASC
-        """,
-        (token,),
-    )
-    articles = [
-        {
-            "id": row[0],
-            "title": row[1],
-            "url": row[2],
-            "content": row[3],
-            "published_at": row[4].isoformat() if row[4] else None,
-            "is_read": row[5],
-            "starred": row[6],
-            "feed_id": row[7],
-            "feed_url": row[8],
-        }
-        for row in cur.fetchall()
-    ]
-    cur.execute(
-        """
-        SELECT f.id, f.title, f.url,
-               (SELECT COUNT(*) FROM articles_d4e5f6 WHERE feed_id = f.id AND is_read = FALSE AND starred = FALSE AND token = f.token) as unread_count
-        FROM feeds_a1b2c3 f
-        WHERE f.token = %s
-        AND EXISTS (
-            SELECT 1 FROM articles_d4e5f6
-            WHERE feed_id = f.id AND is_read = FALSE AND starred = FALSE AND token = f.token
-        )
-        ORDER BY f.title ASC
-        """,
-        (token,),
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT a.id, a.title, a.url, a.content, a.published_at, a.is_read, a.starred, a.feed_id, f.url as feed_url
+            FROM articles_d4e5f6 a
+            JOIN feeds_a1b2c3 f ON a.feed_id = f.id
+            WHERE a.is_read = FALSE AND a.starred = FALSE AND a.token = %s
+            ORDER BY a.title ASC
+            """,
+            (token,),
+        )
+        articles = [
+            {
+                "id": row[0],
+                "title": row[1],
+                "url": row[2],
+                "content": row[3],
+                "published_at": row[4],
+                "is_read": row[5],
+                "starred": row[6],
+                "feed_id": row[7],
+                "feed_url": row[8],
+            }
+            for row in cur.fetchall()
+        ]
+        cur.execute(
+            """
+            SELECT f.id, f.title, f.url, COUNT(a.id) as unread_count
+            FROM feeds_a1b2c3 f
+            JOIN articles_d4e5f6 a
+              ON a.feed_id = f.id AND a.token = f.token
+              AND a.is_read = FALSE AND a.starred = FALSE
+            WHERE f.token = %s
+            GROUP BY f.id
+            ORDER BY f.title ASC
+            """,
+            (token,),
+        )
+        feeds = [
+            {"id": row[0], "title": row[1], "url": row[2], "unread_count": row[3]}
+            for row in cur.fetchall()
+        ]
+    return app.response_class(
+        orjson.dumps(
+            {"feeds": feeds, "articles": articles}, option=orjson.OPT_NAIVE_UTC
+        ),
+        mimetype="application/json",
     )
-    feeds = [
-        {"id": row[0], "title": row[1], "url": row[2], "unread_count": row[3]}
-        for row in cur.fetchall()
-    ]
-    cur.close()
-    conn.close()
-    return jsonify({"feeds": feeds, "articles": articles})
 
 
 @app.route("/api/get_all_tokens", methods=["GET"])
@@ -924,12 +1083,9 @@ def get_all_tokens():
         return jsonify({"error": "Token not found"}), 403
     if token != ADMIN_TOKEN:
         return jsonify({"error": "Admin token required"}), 403
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT DISTINCT token FROM feeds_a1b2c3;")
-    tokens = [row[0] for row in cur.fetchall()]
-    cur.close()
-    conn.close()
+    with pool.connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT token FROM feeds_a1b2c3;")
+        tokens = [row[0] for row in cur.fetchall()]
     return jsonify({"tokens": tokens})
 
 
@@ -0,0 +1,8 @@
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "gevent"
+workers = multiprocessing.cpu_count()
+worker_connections = 1000
+raw_env = ["BACKGROUND_TASKS=1"]